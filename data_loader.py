@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from config import DATA_PATH
@@ -9,14 +10,86 @@ class ElectionData:
         if not path.exists():
             raise FileNotFoundError(f"Excel file not found at: {DATA_PATH}")
 
-        raw = pd.read_excel(path, sheet_name=None)
+        raw = self._load_sheets(path)
         self.data = {}
 
         for year, df in raw.items():
             df.columns = [c.strip().upper() for c in df.columns]
             df["AC_NO"] = df["AC_NO"].astype(int)
+            # Vote counts fit easily in int32 (and AC_NO in int16): smaller
+            # dtypes halve the bytes every scan moves. AC_NAME repeats across
+            # years, so category dtype stores each name once.
+            for col in df.columns:
+                if col != "AC_NAME":
+                    df[col] = pd.to_numeric(df[col], downcast="integer")
+            df["AC_NAME"] = df["AC_NAME"].astype("category")
             self.data[str(year).strip()] = df
 
+        # Precomputed {year: {ac_no: row-dict}} index so find_ac is an O(1)
+        # hash probe instead of a full DataFrame scan per call.
+        self._by_ac = {
+            year: df.set_index("AC_NO", drop=False).to_dict(orient="index")
+            for year, df in self.data.items()
+        }
+
+        # Per-year column arrays extracted once at load so the tool endpoints
+        # index contiguous numpy arrays instead of filtering the DataFrame on
+        # every request.
+        skip = {"AC_NO", "AC_NAME", "TOTAL_VOTES"}
+        self._parties = {}
+        self._matrix = {}
+        self._totals = {}
+        self._ac_no = {}
+        self._ac_name = {}
+        self._ac_index = {}
+        self._ac_sorted = {}
+        self._row_from_sorted = {}
+        for year, df in self.data.items():
+            parties = tuple(c for c in df.columns if c not in skip)
+            self._parties[year] = parties
+            self._matrix[year] = np.ascontiguousarray(
+                df[list(parties)].to_numpy())
+            self._totals[year] = df["TOTAL_VOTES"].to_numpy()
+            self._ac_no[year] = df["AC_NO"].to_numpy()
+            self._ac_name[year] = df["AC_NAME"].to_numpy(dtype=object)
+            self._ac_index[year] = {
+                int(ac): i for i, ac in enumerate(self._ac_no[year])
+            }
+            # Sorted view of AC_NO so batch lookups can binary-search the
+            # whole list in one searchsorted call instead of per-AC dict gets.
+            sort_idx = np.argsort(self._ac_no[year], kind="stable")
+            self._ac_sorted[year] = self._ac_no[year][sort_idx]
+            self._row_from_sorted[year] = sort_idx
+
+        # Uppercased name table so search_by_name is one vectorized substring
+        # scan per year instead of pandas .str ops over the column each call.
+        self._names_upper = {
+            year: np.char.upper(names.astype(str))
+            for year, names in self._ac_name.items()
+        }
+
+    @staticmethod
+    def _load_sheets(path: Path):
+        """Load all sheets, via a per-sheet Parquet sidecar cache when fresh.
+
+        read_excel parses XML for every sheet and dominates cold start;
+        Parquet reloads in milliseconds. Cache files sit next to the
+        workbook as <name>.<sheet>.parquet and are rebuilt whenever the
+        workbook is newer.
+        """
+        cache_files = sorted(path.parent.glob(path.name + ".*.parquet"))
+        src_mtime = path.stat().st_mtime
+        if cache_files and all(f.stat().st_mtime >= src_mtime for f in cache_files):
+            return {f.name.split(".")[-2]: pd.read_parquet(f) for f in cache_files}
+
+        raw = pd.read_excel(path, sheet_name=None)
+        try:
+            for sheet, df in raw.items():
+                df.to_parquet(path.parent / f"{path.name}.{sheet}.parquet")
+        except (ImportError, OSError):
+            pass  # no parquet engine or read-only dir: just skip the cache
+        return raw
+
     def get_years(self):
         return list(self.data.keys())
 
@@ -24,41 +97,64 @@ class ElectionData:
         return self.data.get(str(year))
 
     def find_ac(self, year: str, ac_no: int):
-        df = self.get_year_df(year)
-        if df is None:
-            return None
-        row = df[df["AC_NO"] == int(ac_no)]
-        if row.empty:
-            return None
-        return row.iloc[0].to_dict()
+        return self._by_ac.get(str(year), {}).get(int(ac_no))
 
     def search_by_name(self, name_fragment: str):
         """Return list of {ac_no, ac_name, year} matching the name fragment."""
-        results = []
+        # Accumulate into a dict keyed by ac_no: first-seen wins, so dedup
+        # happens at insert time instead of in a second pass over results.
+        out = {}
         name_fragment = name_fragment.strip().upper()
-        for year, df in self.data.items():
-            matches = df[df["AC_NAME"].str.upper().str.contains(name_fragment, na=False)]
-            for _, row in matches.iterrows():
-                results.append({
-                    "ac_no": int(row["AC_NO"]),
-                    "ac_name": row["AC_NAME"],
+        for year, names_upper in self._names_upper.items():
+            mask = np.char.find(names_upper, name_fragment) != -1
+            for ac_no, ac_name in zip(self._ac_no[year][mask].tolist(),
+                                      self._ac_name[year][mask]):
+                out.setdefault(ac_no, {
+                    "ac_no": ac_no,
+                    "ac_name": ac_name,
                     "year": year
                 })
-                
-        seen = set()
-        unique = []
-        for r in results:
-            if r["ac_no"] not in seen:
-                seen.add(r["ac_no"])
-                unique.append(r)
-        return unique
+        return list(out.values())
+
+    def get_ac_row_index(self, year: str, ac_no: int):
+        """Row index of an AC in the per-year arrays, or None."""
+        return self._ac_index.get(str(year), {}).get(int(ac_no))
+
+    def get_row_indices(self, year: str, ac_list):
+        """Row indices for a list of ACs as an int64 array; -1 marks misses."""
+        year = str(year)
+        sorted_ac = self._ac_sorted.get(year)
+        if sorted_ac is None or not len(ac_list):
+            return np.full(len(ac_list), -1, dtype=np.int64)
+        try:
+            acs = np.asarray(ac_list, dtype=np.int64)
+        except OverflowError:
+            # pydantic ints are arbitrary precision; an AC number outside
+            # int64 is just a miss, so fall back to the dict index.
+            index = self._ac_index.get(year, {})
+            return np.fromiter((index.get(a, -1) for a in ac_list),
+                               dtype=np.int64, count=len(ac_list))
+        pos = np.minimum(np.searchsorted(sorted_ac, acs), len(sorted_ac) - 1)
+        rows = self._row_from_sorted[year][pos]
+        return np.where(sorted_ac[pos] == acs, rows, -1)
+
+    def get_year_arrays(self, year: str):
+        """Return (parties, matrix, totals, ac_no, ac_name) for a year, or None."""
+        year = str(year)
+        if year not in self._matrix:
+            return None
+        return (self._parties[year], self._matrix[year], self._totals[year],
+                self._ac_no[year], self._ac_name[year])
 
     def get_parties(self, year: str):
-        df = self.get_year_df(year)
-        if df is None:
-            return []
-        skip = {"AC_NO", "AC_NAME", "TOTAL_VOTES"}
-        return [c for c in df.columns if c not in skip]
+        return list(self._parties.get(str(year), ()))
+
 
+_election_data = None
 
-election_data = ElectionData()
\ No newline at end of file
+def get_election_data():
+    """Lazy singleton: importing this module no longer pays the load cost."""
+    global _election_data
+    if _election_data is None:
+        _election_data = ElectionData()
+    return _election_data
\ No newline at end of file
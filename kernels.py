@@ -0,0 +1,53 @@
+"""JIT-compiled numeric kernels for the hot tool-endpoint math.
+
+The share/swing/winner computations are pure int/float array work, which
+numba compiles to native code and fuses into single passes with no numpy
+temporaries. cache=True persists the compiled binaries next to this file
+so the JIT cost is paid once, not per process. numba is optional: without
+it the kernels run as plain Python over numpy arrays, which is still
+correct, just slower.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def compute_shares(votes, totals):
+    """Vote share percentages, rounded to 2 decimals; 0 where total is 0."""
+    out = np.empty(votes.shape[0], dtype=np.float64)
+    for i in range(votes.shape[0]):
+        t = totals[i]
+        if t == 0:
+            out[i] = 0.0
+        else:
+            out[i] = np.round(votes[i] / t * 10000.0) / 100.0
+    return out
+
+
+@njit(cache=True)
+def compute_swing(v_from, t_from, v_to, t_to):
+    """Fused (shares_from, shares_to, swing) for a batch of ACs."""
+    n = v_from.shape[0]
+    shares_from = np.empty(n, dtype=np.float64)
+    shares_to = np.empty(n, dtype=np.float64)
+    swing = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        sf = np.round(v_from[i] / t_from[i] * 10000.0) / 100.0 if t_from[i] else 0.0
+        st = np.round(v_to[i] / t_to[i] * 10000.0) / 100.0 if t_to[i] else 0.0
+        shares_from[i] = sf
+        shares_to[i] = st
+        swing[i] = np.round((st - sf) * 100.0) / 100.0
+    return shares_from, shares_to, swing
+
+
+@njit(cache=True)
+def winner_and_shares(row, total):
+    """(argmax index, rounded shares) for one AC's party vote vector."""
+    return int(np.argmax(row)), compute_shares(row, np.full(row.shape[0], total))
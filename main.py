@@ -1,22 +1,65 @@
 import threading
 import time
+import httpx
 import uvicorn
 
 from mcp_server import app as mcp_app
 from mcp_client import ElectionAgent
-from config import MCP_HOST, MCP_PORT
+from config import GROQ_API_KEY, MCP_HOST, MCP_PORT, MCP_BASE_URL
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="langchain")
 
 def start_server():
-    uvicorn.run(mcp_app, host=MCP_HOST, port=MCP_PORT, log_level="error")
+    # uvloop + httptools (from uvicorn[standard]) are 2-4x faster than the
+    # pure-Python asyncio/h11 fallbacks; access logs cost a line per request.
+    uvicorn.run(mcp_app, host=MCP_HOST, port=MCP_PORT, log_level="error",
+                loop="uvloop", http="httptools", access_log=False)
+
+def wait_for_server():
+    """Poll the health endpoint until the server answers.
+
+    Replaces a fixed 2 s sleep: usually ready within ~50 ms, and a slow
+    machine gets up to 2.5 s instead of a race.
+    """
+    for _ in range(50):
+        try:
+            httpx.get(f"{MCP_BASE_URL}/", timeout=0.1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+
+_agent_holder = {}
+
+def build_agent():
+    """Construct (and warm) the agent off the main thread.
+
+    The langchain imports and the first LLM call are the slow parts of
+    startup; doing them here overlaps them with the user typing their
+    first prompt.
+    """
+    try:
+        agent = ElectionAgent()
+    except Exception as e:
+        # Surface construction errors (e.g. missing GROQ_API_KEY) on first
+        # use instead of dying silently in this daemon thread.
+        _agent_holder["error"] = e
+        return
+    if GROQ_API_KEY:
+        try:
+            agent.llm.invoke("ping")  # warm the first-call handshake
+        except Exception:
+            pass
+    _agent_holder["agent"] = agent
 
 if __name__ == "__main__":
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
-    time.sleep(2)
+    wait_for_server()
 
-    agent = ElectionAgent()
+    agent_thread = threading.Thread(target=build_agent, daemon=True)
+    agent_thread.start()
+
+    agent = None
     while True:
         try:
             query = input("User: ").strip()
@@ -30,6 +73,12 @@ if __name__ == "__main__":
             print("Exit!")
             break
 
+        if agent is None:
+            agent_thread.join()
+            if "error" in _agent_holder:
+                raise _agent_holder["error"]
+            agent = _agent_holder["agent"]
+
         print("Agent: ", end="", flush=True)
         response = agent.chat(query)
         print(response)
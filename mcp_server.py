@@ -1,19 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional
+import numpy as np
 import uvicorn
 import json
 
-from data_loader import election_data
+from data_loader import get_election_data
+from kernels import compute_shares, compute_swing, winner_and_shares
 from config import MCP_HOST, MCP_PORT
 
-app = FastAPI(title="AP Election MCP Server")
 
-PARTIES_KEY = {"AC_NO", "AC_NAME", "TOTAL_VOTES"}
-
-def _get_parties(row: dict):
-    return [k for k in row if k not in PARTIES_KEY]
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Warm the dataset once before serving so no request pays the load cost.
+    get_election_data()
+    yield
 
+app = FastAPI(title="AP Election MCP Server",
+              default_response_class=ORJSONResponse,
+              lifespan=_lifespan)
 
 class GetACResultsRequest(BaseModel):
     ac_list: list[int]
@@ -58,6 +65,7 @@ class BatchQueryRequest(BaseModel):
 @app.post("/tools/get_ac_results")
 def get_ac_results(req: GetACResultsRequest):
     """Full results for one or many ACs in a given year."""
+    election_data = get_election_data()
     df = election_data.get_year_df(req.year)
     if df is None:
         return {"error": f"Invalid year '{req.year}'. Valid years: {election_data.get_years()}"}
@@ -70,11 +78,12 @@ def get_ac_results(req: GetACResultsRequest):
 
 @app.post("/tools/get_winner")
 def get_winner(req: GetWinnerRequest):
+    election_data = get_election_data()
     row = election_data.find_ac(req.year, req.ac)
     if not row:
         return {"error": f"AC {req.ac} not found in year {req.year}"}
 
-    parties = _get_parties(row)
+    parties = election_data.get_parties(req.year)
     if not parties:
         return {"error": "No party data found"}
 
@@ -96,13 +105,14 @@ def get_winner(req: GetWinnerRequest):
 
 @app.post("/tools/get_party_vote_share")
 def get_party_vote_share(req: GetPartyVoteShareRequest):
+    election_data = get_election_data()
     row = election_data.find_ac(req.year, req.ac)
     if not row:
         return {"error": f"AC {req.ac} not found in year {req.year}"}
 
     party = req.party.upper()
     if party not in row:
-        return {"error": f"Party '{party}' not in dataset. Available: {_get_parties(row)}"}
+        return {"error": f"Party '{party}' not in dataset. Available: {election_data.get_parties(req.year)}"}
 
     total = row.get("TOTAL_VOTES", 0)
     votes = row[party]
@@ -121,81 +131,112 @@ def get_party_vote_share(req: GetPartyVoteShareRequest):
 
 @app.post("/tools/compute_vote_swing")
 def compute_vote_swing(req: ComputeVoteSwingRequest):
+    election_data = get_election_data()
     party = req.party.upper()
-    results = []
-    for ac in req.ac_list:
-        row_from = election_data.find_ac(req.year_from, ac)
-        row_to = election_data.find_ac(req.year_to, ac)
+    idx_from = election_data.get_row_indices(req.year_from, req.ac_list)
+    idx_to = election_data.get_row_indices(req.year_to, req.ac_list)
+    valid = (idx_from >= 0) & (idx_to >= 0)
+
+    # One gather + divide + subtract over all valid ACs at once, instead of
+    # per-AC Python arithmetic.
+    party_ok = False
+    if valid.any():
+        parties_from, m_from, t_from, _, names_from = \
+            election_data.get_year_arrays(req.year_from)
+        parties_to, m_to, t_to, _, _ = election_data.get_year_arrays(req.year_to)
+        party_ok = party in parties_from and party in parties_to
+        if party_ok:
+            rows_from = idx_from[valid]
+            rows_to = idx_to[valid]
+            v_from = m_from[rows_from, parties_from.index(party)]
+            v_to = m_to[rows_to, parties_to.index(party)]
+            shares_from, shares_to, swings = compute_swing(
+                v_from, t_from[rows_from], v_to, t_to[rows_to])
+            names = names_from[rows_from]
 
-        if not row_from:
+    results = []
+    k = 0
+    for j, ac in enumerate(req.ac_list):
+        if idx_from[j] < 0:
             results.append({"ac_no": ac, "error": f"Not found in {req.year_from}"})
             continue
-        if not row_to:
+        if idx_to[j] < 0:
             results.append({"ac_no": ac, "error": f"Not found in {req.year_to}"})
             continue
-
-        if party not in row_from or party not in row_to:
+        if not party_ok:
             results.append({"ac_no": ac, "error": f"Party '{party}' not in dataset"})
             continue
-
-        total_from = row_from.get("TOTAL_VOTES", 0)
-        total_to = row_to.get("TOTAL_VOTES", 0)
-        share_from = round(row_from[party] / total_from * 100, 2) if total_from else 0
-        share_to = round(row_to[party] / total_to * 100, 2) if total_to else 0
-        swing = round(share_to - share_from, 2)
-
         results.append({
             "ac_no": ac,
-            "ac_name": row_from["AC_NAME"],
+            "ac_name": names[k],
             "party": party,
-            f"vote_share_{req.year_from}_pct": share_from,
-            f"vote_share_{req.year_to}_pct": share_to,
-            "swing_pct": swing
+            f"vote_share_{req.year_from}_pct": float(shares_from[k]),
+            f"vote_share_{req.year_to}_pct": float(shares_to[k]),
+            "swing_pct": float(swings[k])
         })
+        k += 1
 
     return {"swing_results": results, "year_from": req.year_from, "year_to": req.year_to}
 
 
 @app.post("/tools/compare_across_elections")
 def compare_across_elections(req: CompareAcrossElectionsRequest):
+    election_data = get_election_data()
     years = election_data.get_years()
     comparison = {}
 
     for year in sorted(years):
-        row = election_data.find_ac(year, req.ac)
-        if row:
-            parties = _get_parties(row)
-            total = row.get("TOTAL_VOTES", 0)
-            winner = max(parties, key=lambda p: row.get(p, 0)) if parties else "N/A"
-            party_shares = {}
-            for p in parties:
-                votes = row[p]
-                share = round(votes / total * 100, 2) if total else 0
-                party_shares[p] = {"votes": votes, "share_pct": share}
-            comparison[year] = {
-                "ac_name": row["AC_NAME"],
-                "winner": winner,
-                "total_votes": total,
-                "party_results": party_shares
-            }
-        else:
+        i = election_data.get_ac_row_index(year, req.ac)
+        if i is None:
             comparison[year] = {"error": "Data not found"}
+            continue
+
+        parties, matrix, totals, _, ac_names = election_data.get_year_arrays(year)
+        votes = matrix[i]
+        total = int(totals[i])
+        # One argmax over the row's party vector replaces the per-party
+        # Python max(); shares come from a single fused kernel pass.
+        win_idx, shares = winner_and_shares(votes, totals[i])
+        winner = parties[win_idx] if parties else "N/A"
+        party_shares = {
+            p: {"votes": v, "share_pct": s}
+            for p, v, s in zip(parties, votes.tolist(), shares.tolist())
+        }
+        comparison[year] = {
+            "ac_name": ac_names[i],
+            "winner": winner,
+            "total_votes": total,
+            "party_results": party_shares
+        }
 
     return {"ac_no": req.ac, "comparison": comparison}
 
 @app.post("/tools/get_top_constituencies")
 def get_top_constituencies(req: GetTopConstituenciesRequest):
+    election_data = get_election_data()
     party = req.party.upper()
-    df = election_data.get_year_df(req.year)
-    if df is None:
+    arrays = election_data.get_year_arrays(req.year)
+    if arrays is None:
         return {"error": f"Invalid year '{req.year}'"}
-    if party not in df.columns:
+    parties, matrix, totals, ac_no, ac_name = arrays
+    if party not in parties:
         return {"error": f"Party '{party}' not found in {req.year}"}
 
-    df = df.copy()
-    df["vote_share_pct"] = (df[party] / df["TOTAL_VOTES"] * 100).round(2)
-    df_sorted = df.sort_values("vote_share_pct", ascending=req.bottom)
-    top = df_sorted.head(req.top_n)
+    votes = matrix[:, parties.index(party)]
+    shares = compute_shares(votes, totals)
+
+    # Partial selection (O(N)) of the top/bottom N, then sort just those N —
+    # avoids copying and fully sorting the DataFrame per request. top_n is
+    # Optional, and a null means all rows (as df.head(None) did).
+    n = len(shares) if req.top_n is None else max(0, min(req.top_n, len(shares)))
+    if n == 0:
+        idx = np.empty(0, dtype=np.intp)
+    elif req.bottom:
+        idx = np.argpartition(shares, n - 1)[:n]
+        idx = idx[np.argsort(shares[idx])]
+    else:
+        idx = np.argpartition(shares, len(shares) - n)[-n:]
+        idx = idx[np.argsort(shares[idx])[::-1]]
 
     return {
         "party": party,
@@ -203,45 +244,54 @@ def get_top_constituencies(req: GetTopConstituenciesRequest):
         "order": "bottom" if req.bottom else "top",
         "results": [
             {
-                "ac_no": int(row["AC_NO"]),
-                "ac_name": row["AC_NAME"],
-                "votes": int(row[party]),
-                "total_votes": int(row["TOTAL_VOTES"]),
-                "vote_share_pct": row["vote_share_pct"]
+                "ac_no": a,
+                "ac_name": name,
+                "votes": v,
+                "total_votes": t,
+                "vote_share_pct": s
             }
-            for _, row in top.iterrows()
+            # .tolist() converts each slice to native Python scalars in one
+            # C call, instead of an int()/float() cast per cell.
+            for a, name, v, t, s in zip(
+                ac_no[idx].tolist(), ac_name[idx].tolist(), votes[idx].tolist(),
+                totals[idx].tolist(), shares[idx].tolist()
+            )
         ]
     }
 
 @app.post("/tools/get_state_party_summary")
 def get_state_party_summary(req: GetStatePartySummaryRequest):
-    df = election_data.get_year_df(req.year)
-    if df is None:
+    arrays = get_election_data().get_year_arrays(req.year)
+    if arrays is None:
         return {"error": f"Invalid year '{req.year}'"}
+    parties, M, totals, _, _ = arrays
+    total_votes = int(totals.sum())
+
+    # One pass over the party matrix: column sums for totals, a single
+    # row-wise argmax reused for seat counts instead of P idxmax scans.
+    party_totals = M.sum(axis=0)
+    seats = np.bincount(M.argmax(axis=1), minlength=len(parties))
 
-    parties = election_data.get_parties(req.year)
-    total_votes = int(df["TOTAL_VOTES"].sum())
     summary = {}
-    for p in parties:
-        p_votes = int(df[p].sum())
+    for i, p in enumerate(parties):
+        p_votes = int(party_totals[i])
         share = round(p_votes / total_votes * 100, 2) if total_votes else 0
-        seats_won = int((df[parties].idxmax(axis=1) == p).sum())
         summary[p] = {
             "total_votes": p_votes,
             "vote_share_pct": share,
-            "seats_won": seats_won
+            "seats_won": int(seats[i])
         }
 
     return {
         "year": req.year,
         "total_votes_polled": total_votes,
-        "total_constituencies": len(df),
+        "total_constituencies": len(M),
         "party_summary": summary
     }
 
 @app.post("/tools/search_constituency_by_name")
 def search_constituency_by_name(req: SearchConstituencyByNameRequest):
-    results = election_data.search_by_name(req.name_fragment)
+    results = get_election_data().search_by_name(req.name_fragment)
     if not results:
         return {"error": f"No constituency found matching '{req.name_fragment}'"}
     return {"matches": results}
@@ -249,31 +299,74 @@ def search_constituency_by_name(req: SearchConstituencyByNameRequest):
 @app.post("/tools/batch_query")
 def batch_query(req: BatchQueryRequest):
     """Multi-AC × multi-party × multi-year query in one call."""
+    election_data = get_election_data()
+    req_parties = [p.upper() for p in req.parties]
     output = {}
     for year in req.years:
-        output[year] = {}
-        for ac in req.ac_list:
-            row = election_data.find_ac(year, ac)
-            if not row:
-                output[year][str(ac)] = "Not found"
+        year_out = {}
+        output[year] = year_out
+        arrays = election_data.get_year_arrays(year)
+        if arrays is None:
+            for ac in req.ac_list:
+                year_out[str(ac)] = "Not found"
+            continue
+        parties, matrix, totals, _, ac_names = arrays
+
+        idx = election_data.get_row_indices(year, req.ac_list)
+        valid = idx >= 0
+        rows = np.where(valid, idx, 0)
+        known = [p for p in req_parties if p in parties]
+        known_pos = {p: k for k, p in enumerate(known)}
+        cols = np.fromiter((parties.index(p) for p in known), dtype=np.intp,
+                           count=len(known))
+
+        # One 2D gather and one broadcast divide cover every (AC, party)
+        # cell for the year; the loops below only assemble the dicts.
+        V = matrix[rows[:, None], cols[None, :]]
+        T = totals[rows]
+        S = np.round(V / np.where(T == 0, 1, T)[:, None] * 100, 2)
+        votes_rows = V.tolist()
+        share_rows = S.tolist()
+        totals_list = T.tolist()
+
+        for j, ac in enumerate(req.ac_list):
+            if not valid[j]:
+                year_out[str(ac)] = "Not found"
                 continue
-            total = row.get("TOTAL_VOTES", 0)
-            ac_data = {"ac_name": row["AC_NAME"], "total_votes": total, "parties": {}}
-            for party in req.parties:
-                p = party.upper()
-                if p in row:
-                    votes = row[p]
-                    share = round(votes / total * 100, 2) if total else 0
-                    ac_data["parties"][p] = {"votes": votes, "vote_share_pct": share}
+            ac_parties = {}
+            for p in req_parties:
+                k = known_pos.get(p)
+                if k is None:
+                    ac_parties[p] = "Not available"
                 else:
-                    ac_data["parties"][p] = "Not available"
-            output[year][str(ac)] = ac_data
+                    ac_parties[p] = {"votes": votes_rows[j][k],
+                                     "vote_share_pct": share_rows[j][k]}
+            year_out[str(ac)] = {
+                "ac_name": ac_names[rows[j]],
+                "total_votes": totals_list[j],
+                "parties": ac_parties
+            }
 
     return output
 
+# (request model, endpoint) per tool, for in-process dispatch without the
+# HTTP round trip when the server runs embedded in the agent process.
+TOOL_REGISTRY = {
+    "get_ac_results": (GetACResultsRequest, get_ac_results),
+    "get_winner": (GetWinnerRequest, get_winner),
+    "get_party_vote_share": (GetPartyVoteShareRequest, get_party_vote_share),
+    "compute_vote_swing": (ComputeVoteSwingRequest, compute_vote_swing),
+    "compare_across_elections": (CompareAcrossElectionsRequest, compare_across_elections),
+    "get_top_constituencies": (GetTopConstituenciesRequest, get_top_constituencies),
+    "get_state_party_summary": (GetStatePartySummaryRequest, get_state_party_summary),
+    "search_constituency_by_name": (SearchConstituencyByNameRequest, search_constituency_by_name),
+    "batch_query": (BatchQueryRequest, batch_query),
+}
+
 @app.get("/") # Health check and basic info
 def root():
-    return {"status": "ok", "message": "AP Election MCP Server running", "years": election_data.get_years()}
+    return {"status": "ok", "message": "AP Election MCP Server running", "years": get_election_data().get_years()}
 
 if __name__ == "__main__":
-    uvicorn.run(app, host=MCP_HOST, port=MCP_PORT)
\ No newline at end of file
+    uvicorn.run(app, host=MCP_HOST, port=MCP_PORT,
+                loop="uvloop", http="httptools", access_log=False)
\ No newline at end of file